@@ -1,110 +1,348 @@
 # src/threewordhash/core.py
 import hmac
 import hashlib
+import itertools
 import unicodedata
 import os
 import string
-from typing import List
+import struct
+from functools import cached_property, lru_cache
+from typing import List, Optional, Sequence, Tuple
 
 import argparse
 
+try:
+    import blake3
+except ImportError:  # optional, see the `blake3` extra
+    blake3 = None
+
+# Keyed hashes an ID can be derived from. IDs from different algorithms don't
+# match, so whoever verifies an ID needs to use the same one.
+HASH_ALGORITHMS = ("hmac-sha256", "blake2b", "blake3")
+
+
+def algorithm_error(algorithm: str) -> Optional[str]:
+    """
+    Why `algorithm` can't be used here, or None if it can.
+    """
+    if algorithm not in HASH_ALGORITHMS:
+        return f"Unknown hash algorithm {algorithm!r}, use one of {HASH_ALGORITHMS}."
+    if algorithm == "blake3" and blake3 is None:
+        return "The blake3 algorithm needs the blake3 package (pip install .[blake3])."
+    return None
+
+
+# ---- Hash backend ----
+# hashlib.sha256 comes from `_hashlib` when CPython is linked against OpenSSL,
+# which picks SHA-NI/ARMv8 instructions at runtime (OpenSSL 1.1.1+). Builds
+# without it fall back to the much slower built-in implementation.
+_OPENSSL_SHA256 = hashlib.sha256.__module__ == "_hashlib"
+
+if os.environ.get("THREEWORDHASH_FORCE_OPENSSL") == "1" and not _OPENSSL_SHA256:
+    raise RuntimeError(
+        "THREEWORDHASH_FORCE_OPENSSL is set, but hashlib is using the built-in "
+        f"SHA-256 ({hashlib.sha256.__module__}). "
+        "Use a Python linked against OpenSSL 1.1.1+."
+    )
+
+
+def sha256_backend() -> str:
+    """
+    Name of the SHA-256 implementation in use, e.g. 'OpenSSL 3.0.2 15 Mar 2022'
+    or 'builtin (_sha2)'.
+    """
+    if _OPENSSL_SHA256:
+        import ssl
+
+        return ssl.OPENSSL_VERSION
+    return f"builtin ({hashlib.sha256.__module__})"
+
 
 # ---- Utilities ----
 def _normalize(s: str) -> str:
     # Lowercase, strip, collapse internal whitespace, NFKC normalize
-    s = unicodedata.normalize("NFKC", s.strip().lower())
+    s = s.strip().lower()
+    if not s.isascii():
+        # NFKC never changes pure ASCII, so only pay for it on other input
+        s = unicodedata.normalize("NFKC", s)
     return " ".join(s.split())
 
 
-def _hmac_sha256(key: bytes, msg: str) -> bytes:
-    return hmac.new(key, _normalize(msg).encode("utf-8"), hashlib.sha256).digest()
+@lru_cache(maxsize=8)
+def _mac_proto(key: bytes, algorithm: str = "hmac-sha256"):
+    # Pre-keyed hash object; copying it skips the key setup on every call.
+    # All algorithms yield a 32-byte digest.
+    if algorithm == "hmac-sha256":
+        return hmac.new(key, None, hashlib.sha256)
+    if algorithm == "blake2b":
+        # BLAKE2b is natively keyed but takes at most 64 key bytes
+        if len(key) > 64:
+            key = hashlib.blake2b(key).digest()
+        return hashlib.blake2b(key=key, digest_size=32)
+    if algorithm == "blake3" and blake3 is not None:
+        # BLAKE3 keyed mode takes exactly 32 key bytes
+        if len(key) != 32:
+            key = blake3.blake3(key).digest()
+        return blake3.blake3(key=key)
+    raise ValueError(algorithm_error(algorithm))
+
+
+def _keyed_hash(key: bytes, msg: str, algorithm: str = "hmac-sha256") -> bytes:
+    h = _mac_proto(key, algorithm).copy()
+    h.update(_normalize(msg).encode("utf-8"))
+    return h.digest()
 
 
 def _bytes_to_indices(b: bytes, vocab_size: int, n: int) -> List[int]:
     """
     Deterministically turn bytes into n indices in [0, vocab_size).
-    We consume 4 bytes at a time for a 32-bit int and mod by vocab_size.
-    If we run out, we re-hash to extend the stream.
+    We unpack the bytes as big-endian 32-bit ints in one go and mod by vocab_size.
+    If we run out, further blocks are derived from `b` with a counter,
+    sha256(b || i) for i = 1, 2, ... (like HKDF-Expand), one hash per 8 indices.
     """
-    needed = n
-    out = []
-    pool = b
+    vals = list(struct.unpack_from(f">{len(b) // 4}I", b))
     ctr = 0
-    while needed > 0:
-        # consume in 4-byte chunks
-        for i in range(0, len(pool), 4):
-            chunk = pool[i : i + 4]
-            if len(chunk) < 4:
-                break
-            val = int.from_bytes(chunk, "big", signed=False)
-            out.append(val % vocab_size)
-            needed -= 1
-            if needed == 0:
-                break
-        if needed > 0:
-            ctr += 1
-            pool = hashlib.sha256(pool + ctr.to_bytes(2, "big")).digest()
-    return out
+    while len(vals) < n:
+        ctr += 1
+        block = hashlib.sha256(b + ctr.to_bytes(2, "big")).digest()
+        vals.extend(struct.unpack(">8I", block))
+    return [val % vocab_size for val in vals[:n]]
+
+
+_B36_CHARS = string.digits + string.ascii_uppercase
+
+
+@lru_cache(maxsize=None)
+def _b36_table(length: int) -> List[str]:
+    # Every checksum of one length ('0'..'ZZZ', 36**3 = 46,656 at most),
+    # built the first time that length is used
+    return ["".join(p) for p in itertools.product(_B36_CHARS, repeat=length)]
 
 
 def _checksum_base36(b: bytes, length: int = 2) -> str:
     """
     Short base36 checksum over the digest. Not crypto-strong (doesn't need to be);
     purely for typo detection.
+    `b` must already be a cryptographic digest (e.g. the HMAC output), so its
+    bytes are used directly instead of being hashed a second time.
     """
-    num = int.from_bytes(hashlib.sha256(b).digest(), "big")
-    chars = string.digits + string.ascii_uppercase
+    # 16 bytes is ample: 36**5 (max GUI checksum) is only ~60M values
+    num = int.from_bytes(b[:16], "big")
+    if 0 < length <= 3:
+        table = _b36_table(length)
+        return table[num % len(table)]
+    # longer checksums: fall back to digit-by-digit conversion
     out = ""
     for _ in range(length):
-        out = chars[num % 36] + out
+        out = _B36_CHARS[num % 36] + out
         num //= 36
     return out
 
 
+def _digest_to_id_parts(
+    digest: bytes, vocab_size: int, n: int, checksum_len: int
+) -> Tuple[List[int], str]:
+    """
+    Everything after hashing in one go: word indices and checksum of a digest.
+    """
+    if n <= 8:
+        # a single 32-byte digest holds 8 indices, no stream extension needed
+        idxs = [v % vocab_size for v in struct.unpack_from(f">{n}I", digest)]
+    else:
+        idxs = _bytes_to_indices(digest, vocab_size, n)
+    check = _checksum_base36(digest, checksum_len) if checksum_len > 0 else ""
+    return idxs, check
+
+
+def _join_id(idxs: List[int], check: str, wordlist: Sequence[str], sep: str) -> str:
+    words = [wordlist[i] for i in idxs]
+    if check:
+        words.append(check)
+    return sep.join(words)
+
+
+def _join_id_bytes(
+    idxs: List[int], check: str, encoded: Sequence[bytes], sep: bytes
+) -> bytes:
+    words = [encoded[i] for i in idxs]
+    if check:
+        words.append(check.encode("ascii"))
+    return sep.join(words)
+
+
+def _digest_many(
+    inputs: List[str],
+    key: bytes,
+    vocab_size: int,
+    n_words: int,
+    checksum_len: int,
+    algorithm: str,
+) -> List[Tuple[List[int], str]]:
+    if n_words < 2:
+        raise ValueError("Use at least 2 words.")
+    proto = _mac_proto(key, algorithm)
+    digests = []
+    for ipt in inputs:
+        h = proto.copy()
+        h.update(_normalize(ipt).encode("utf-8"))
+        digests.append(h.digest())
+    return [
+        _digest_to_id_parts(d, vocab_size, n_words, checksum_len) for d in digests
+    ]
+
+
 # ---- Public API ----
-def load_wordlist(path: str) -> List[str]:
+class Wordlist(tuple):
+    """
+    Immutable word list (a plain tuple of str). The UTF-8 encoded words are
+    kept in `encoded` once first used, so friendly_id_bytes doesn't re-encode
+    every word.
+    """
+
+    @cached_property
+    def encoded(self) -> Tuple[bytes, ...]:
+        return tuple(w.encode("utf-8") for w in self)
+
+    def __hash__(self):
+        # tuple hashing walks every word; compute once, it's a cache key.
+        # Lazy and never pickled: str hashes differ between processes.
+        h = self.__dict__.get("_hash")
+        if h is None:
+            h = self._hash = tuple.__hash__(self)
+        return h
+
+    def __reduce__(self):
+        # rebuild from the words alone, `encoded` and `_hash` are derived
+        return (self.__class__, (tuple(self),))
+
+
+def load_wordlist(path: str) -> Wordlist:
     """
     Expects one word per line. Leading indices in Diceware files are OK:
     we'll read the last whitespace-separated token on each line.
+    Returned as a Wordlist (tuple) so it can't be changed (or safely cached) later.
     """
-    vocab = []
+    # read and decode in one go; text mode already turns \r\n and \r into \n
     with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-            # handle '12345\tword' or 'word'
-            token = line.split()[-1]
-            vocab.append(token)
+        text = f.read()
+
+    vocab = []
+    seen = set()
+    duplicate = None
+    for parts in map(str.split, text.split("\n")):
+        # skip blank and '#' comment lines
+        if not parts or parts[0].startswith("#"):
+            continue
+        # handle '12345\tword' or 'word'
+        token = parts[-1]
+        if duplicate is None and token in seen:
+            duplicate = token
+        seen.add(token)
+        vocab.append(token)
     if len(vocab) < 512:
         raise ValueError(
             "Wordlist is too short. Use a larger list (e.g., EFF Diceware 7,776 words)."
         )
-    # ensure uniqueness
-    if len(vocab) != len(set(vocab)):
-        raise ValueError("Wordlist contains duplicates.")
-    return vocab
+    # ensure uniqueness (reported after the length check, as it always was)
+    if duplicate is not None:
+        raise ValueError(f"Wordlist contains duplicates ({duplicate!r}).")
+    return Wordlist(vocab)
 
 
 def friendly_id(
     user_input: str,
     secret_salt: str,
-    wordlist: List[str],
+    wordlist: Sequence[str],
     n_words: int = 3,
     checksum_len: int = 2,
     sep: str = "-",
+    algorithm: str = "hmac-sha256",
+    secret_salt_bytes: Optional[bytes] = None,
 ) -> str:
     """
     Create a human-friendly, deterministic ID from input.
     Store ONLY the returned ID. Keep secret_salt secret.
+    `algorithm` is one of HASH_ALGORITHMS; the same one is needed to verify.
+    If the salt is reused a lot, pass it pre-encoded as `secret_salt_bytes`
+    (UTF-8); `secret_salt` is ignored then.
+    Results are memoized when the wordlist is a Wordlist (from load_wordlist).
     """
+    if secret_salt_bytes is None:
+        secret_salt_bytes = secret_salt.encode("utf-8")
+    # only a Wordlist is a cheap cache key, anything else would be hashed
+    # (or copied) word by word on every call
+    make_id = _friendly_id_cached if isinstance(wordlist, Wordlist) else _make_id
+    return make_id(
+        user_input, secret_salt_bytes, wordlist, n_words, checksum_len, sep, algorithm
+    )
+
+
+def _make_id(
+    user_input: str,
+    key: bytes,
+    wordlist: Sequence[str],
+    n_words: int,
+    checksum_len: int,
+    sep: str,
+    algorithm: str,
+) -> str:
     if n_words < 2:
         raise ValueError("Use at least 2 words.")
-    digest = _hmac_sha256(secret_salt.encode("utf-8"), user_input)
-    idxs = _bytes_to_indices(digest, len(wordlist), n_words)
-    words = [wordlist[i] for i in idxs]
-    check = _checksum_base36(digest, checksum_len)
-    return sep.join(words + [check] if checksum_len > 0 else words)
+    digest = _keyed_hash(key, user_input, algorithm)
+    idxs, check = _digest_to_id_parts(digest, len(wordlist), n_words, checksum_len)
+    return _join_id(idxs, check, wordlist, sep)
+
+
+_friendly_id_cached = lru_cache(maxsize=1024)(_make_id)
+
+
+def friendly_id_bytes(
+    user_input: str,
+    secret_salt: str,
+    wordlist: Sequence[str],
+    n_words: int = 3,
+    checksum_len: int = 2,
+    sep: str = "-",
+    algorithm: str = "hmac-sha256",
+    secret_salt_bytes: Optional[bytes] = None,
+) -> bytes:
+    """
+    Same as friendly_id, but returns the UTF-8 encoded ID. Pass a Wordlist
+    (from load_wordlist) to reuse its pre-encoded words.
+    """
+    if n_words < 2:
+        raise ValueError("Use at least 2 words.")
+    if secret_salt_bytes is None:
+        secret_salt_bytes = secret_salt.encode("utf-8")
+    digest = _keyed_hash(secret_salt_bytes, user_input, algorithm)
+    idxs, check = _digest_to_id_parts(digest, len(wordlist), n_words, checksum_len)
+    encoded = getattr(wordlist, "encoded", None)
+    if encoded is None:
+        # plain sequence: encode just the chosen words, not the whole list
+        return _join_id(idxs, check, wordlist, sep).encode("utf-8")
+    return _join_id_bytes(idxs, check, encoded, sep.encode("utf-8"))
+
+
+def friendly_id_many(
+    inputs: List[str],
+    secret_salt: str,
+    wordlist: Sequence[str],
+    n_words: int = 3,
+    checksum_len: int = 2,
+    sep: str = "-",
+    algorithm: str = "hmac-sha256",
+    secret_salt_bytes: Optional[bytes] = None,
+) -> List[str]:
+    """
+    Batch version of friendly_id: same IDs, in the same order as `inputs`.
+    The keyed hash (see `algorithm`) is set up once for all inputs.
+    """
+    if secret_salt_bytes is None:
+        secret_salt_bytes = secret_salt.encode("utf-8")
+    parts = _digest_many(
+        inputs, secret_salt_bytes, len(wordlist), n_words, checksum_len, algorithm
+    )
+    return [_join_id(idxs, check, wordlist, sep) for idxs, check in parts]
 
 
 def create_salt_digest(byte_length: int = 32) -> str:
@@ -163,6 +401,15 @@ def parse_args():
         default=2,
     )
 
+    argparser.add_argument(
+        "-a",
+        "--algorithm",
+        type=str,
+        choices=HASH_ALGORITHMS,
+        help="Keyed hash the ID is derived from (default: hmac-sha256)",
+        default="hmac-sha256",
+    )
+
     args = argparser.parse_args()
 
     return args
@@ -175,18 +422,27 @@ def main():
         print("Please provide a valid path to a wordlist file.")
         return
 
+    error = algorithm_error(args.algorithm)
+    if error is not None:
+        print(error)
+        return
+
     if args.salt is None:
         # create a random salt
         args.salt = create_salt_digest(args.salt_size)
         print("Generated random salt:", args.salt)
 
     wordlist = load_wordlist(args.wordlist)
-    for ipt in args.input or []:
-        pid = friendly_id(
-            ipt,
-            args.salt,
-            wordlist,
-            args.nwords,
-            args.checksum,
-        )
+    inputs = args.input or []
+    if args.algorithm != "hmac-sha256":
+        print("Hash algorithm:", args.algorithm)
+    pids = friendly_id_many(
+        inputs,
+        args.salt,
+        wordlist,
+        args.nwords,
+        args.checksum,
+        algorithm=args.algorithm,
+    )
+    for ipt, pid in zip(inputs, pids):
         print(f"{ipt} -> {pid}")
@@ -1,5 +1,6 @@
 # src/threewordhash/gui.py
 import sys
+from typing import Sequence
 
 
 from PySide6 import QtCore
@@ -18,6 +19,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtGui import QFont
 
 from threewordhash.core import (
+    algorithm_error,
     create_salt_digest,
     friendly_id,
     load_wordlist,
@@ -27,39 +29,81 @@ from threewordhash.core import (
 # from threewordhash import encode, decode, Wordlist
 
 
+class _EncodeJob(QtCore.QRunnable):
+    """
+    Runs friendly_id off the GUI thread on a snapshot of the parameters and
+    hands (seq, result) to `done`, or (seq, error message) to `failed`.
+    """
+
+    def __init__(self, seq: int, params: dict, done, failed):
+        super().__init__()
+        self._seq = seq
+        self._params = params
+        self._done = done
+        self._failed = failed
+
+    def run(self):
+        try:
+            result = friendly_id(**self._params)
+        except Exception as e:
+            # don't let it die on the worker thread, the GUI has to show it
+            self._failed(self._seq, str(e))
+            return
+        self._done(self._seq, result)
+
+
 class TWHApp(QMainWindow):
 
     # create signal for updating the salt text
     _custom_salt = QtCore.Signal(str)
     _new_id = QtCore.Signal(str)
+    # (sequence number, id) from a finished _EncodeJob
+    _encoded = QtCore.Signal(int, str)
+    # (sequence number, error message) from a failed _EncodeJob
+    _encode_failed = QtCore.Signal(int, str)
 
     def __init__(
         self,
-        wordlist: list[str],
+        wordlist: Sequence[str],
         salt: str = "",
         salt_size: int = 32,
         word_count: int = 3,
         checksum_len: int = 2,
         sep: str = "-",
         lock_salt: bool = False,
+        algorithm: str = "hmac-sha256",
     ):
         super().__init__()
 
         self._salt = salt
+        self._salt_bytes = salt.encode("utf-8")
         self._salt_size = salt_size
 
         self._word_count = word_count
         self._checksum_len = checksum_len
         self._sep = sep
+        self._algorithm = algorithm
 
         self._wordlist = wordlist
 
         self._current_input = ""
 
+        # debounce state: one pending encode at a time, skip unchanged inputs
+        self._pending = False
+        self._last_key = None
+
+        # background encoding: one worker, only the latest job's result is shown
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._seq = 0
+        self._encoded.connect(self._on_encoded)
+        self._encode_failed.connect(self._on_encode_failed)
+
         self._init_ui(lock_salt)
 
     def _set_salt(self, salt: str):
         self._salt = salt
+        self._salt_bytes = salt.encode("utf-8")
         self._custom_salt.emit(salt)
         self.encode()
 
@@ -160,9 +204,7 @@ class TWHApp(QMainWindow):
         input_label = QLabel("Input:")
         input_field = QLineEdit()
         input_field.setPlaceholderText("e.g., name or email")
-        input_field.editingFinished.connect(
-            lambda: self._update_input(input_field.text())
-        )
+        input_field.textChanged.connect(self._update_input)
         input_field.setFont(QFont("Serif", 20))
 
         input_layout.addWidget(input_label)
@@ -187,22 +229,71 @@ class TWHApp(QMainWindow):
         central_widget.setLayout(layout)
 
     def encode(self):
-        result = friendly_id(
+        # Debounced: bursts of changes (e.g. typing) collapse into one encode
+        if self._pending:
+            return
+        self._pending = True
+        QtCore.QTimer.singleShot(50, self._do_encode)
+
+    def _do_encode(self):
+        self._pending = False
+
+        key = (
+            self._current_input,
+            self._salt,
+            self._word_count,
+            self._checksum_len,
+            self._sep,
+            self._algorithm,
+        )
+        if key == self._last_key:
+            return
+        self._last_key = key
+
+        params = dict(
             user_input=self._current_input,
             secret_salt=self._salt,
+            secret_salt_bytes=self._salt_bytes,
             wordlist=self._wordlist,
             n_words=self._word_count,
             checksum_len=self._checksum_len,
             sep=self._sep,
+            algorithm=self._algorithm,
+        )
+
+        # drop jobs that haven't started yet, they're superseded by this one
+        self._pool.clear()
+        self._seq += 1
+        self._pool.start(
+            _EncodeJob(
+                self._seq, params, self._encoded.emit, self._encode_failed.emit
+            )
         )
 
+    def _on_encoded(self, seq: int, result: str):
+        # results of superseded jobs are stale
+        if seq != self._seq:
+            return
         self._new_id.emit(result)
         self.adjustSize()
 
+    def _on_encode_failed(self, seq: int, message: str):
+        if seq != self._seq:
+            return
+        # allow the same parameters to be tried again on the next change
+        self._last_key = None
+        self._new_id.emit(f"Error: {message}")
+        self.adjustSize()
+
 
 def main():
     args = parse_args()
 
+    error = algorithm_error(args.algorithm)
+    if error is not None:
+        print(error)
+        return
+
     # Create a minimal UI using pyside6
     app = QApplication(sys.argv)
 
@@ -217,6 +308,7 @@ def main():
         checksum_len=args.checksum,
         sep="-",
         lock_salt=args.salt is not None,
+        algorithm=args.algorithm,
     )
     window.setWindowTitle("Three Word Hash Generator")
 